@@ -14,18 +14,30 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import hashlib
+import io
 import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from html import escape
 from pathlib import Path
 from typing import Iterable, List, Sequence
 
 from docx import Document  # type: ignore
 from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT  # type: ignore
-from docx.enum.text import WD_ALIGN_PARAGRAPH  # type: ignore
-from docx.oxml.ns import qn  # type: ignore
+from docx.enum.text import WD_COLOR_INDEX  # type: ignore
+from docx.oxml.ns import nsmap, qn  # type: ignore
+from docx.shared import Length, Pt, Twips  # type: ignore
+from lxml import etree  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # Optional: fall back to the standard library json module.
+    orjson = None
 
 
 # Get the script's directory to resolve relative paths
@@ -35,10 +47,56 @@ DEFAULT_OUTPUT = SCRIPT_DIR.parent / "data"
 INDEX_FILENAME = "guides.index.json"
 HTML_SUBDIR = "html"
 DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+# Version 2: cellData content is plain text that is already stripped, so
+# fetch_drug_summaries.py can use it as-is instead of re-normalizing it.
+CELL_DATA_VERSION = 2
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+# Run children that contribute text, mirroring python-docx's `Run.text`.
+_RUN_TEXT_TAGS = tuple(qn(f"w:{tag}") for tag in ("br", "cr", "noBreakHyphen", "ptab", "t", "tab"))
+
+# Clark-notation names resolved once instead of calling qn() per XML lookup.
+_QN_P = qn("w:p")
+_QN_R = qn("w:r")
+_QN_PPR = qn("w:pPr")
+_QN_RPR = qn("w:rPr")
+_QN_JC = qn("w:jc")
+_QN_SPACING = qn("w:spacing")
+_QN_NUMPR = qn("w:numPr")
+_QN_B = qn("w:b")
+_QN_I = qn("w:i")
+_QN_U = qn("w:u")
+_QN_SZ = qn("w:sz")
+_QN_COLOR = qn("w:color")
+_QN_HIGHLIGHT = qn("w:highlight")
+_QN_VAL = qn("w:val")
+_QN_W = qn("w:w")
+_QN_FILL = qn("w:fill")
+_QN_BEFORE = qn("w:before")
+_QN_AFTER = qn("w:after")
+_QN_LINE = qn("w:line")
+_QN_LINE_RULE = qn("w:lineRule")
+_QN_SIDES = {
+    side: qn(f"w:{side}")
+    for side in ("top", "bottom", "left", "right", "insideH", "insideV")
+}
+
+# Border and margin side elements, each fetched with a single compiled query.
+_XPATH_NS = {"w": nsmap["w"]}
+_CELL_BORDERS_XPATH = etree.XPath("./w:tcPr/w:tcBorders[1]/*", namespaces=_XPATH_NS)
+_CELL_MARGINS_XPATH = etree.XPath("./w:tcPr/w:tcMar[1]/*", namespaces=_XPATH_NS)
+_TABLE_BORDERS_XPATH = etree.XPath("./w:tblPr/w:tblBorders[1]/*", namespaces=_XPATH_NS)
+_TABLE_MARGINS_XPATH = etree.XPath("./w:tblPr/w:tblCellMar[1]/*", namespaces=_XPATH_NS)
+_SIDE_BY_QN = {qn_name: side for side, qn_name in _QN_SIDES.items()}
 
 
+# Explicit __slots__ rather than dataclass(slots=True), which needs Python 3.10.
+# Slotted fields cannot have class-level defaults, so every field is passed in.
 @dataclass
 class CourseContext:
+    __slots__ = ("name", "slug", "path", "tags")
+
     name: str
     slug: str
     path: Path
@@ -47,6 +105,17 @@ class CourseContext:
 
 @dataclass
 class GuideMetadata:
+    __slots__ = (
+        "title",
+        "course",
+        "slug",
+        "source_path",
+        "json_path",
+        "html_path",
+        "tags",
+        "table_count",
+    )
+
     title: str
     course: CourseContext
     slug: str
@@ -54,7 +123,7 @@ class GuideMetadata:
     json_path: Path
     html_path: Path
     tags: List[str]
-    table_count: int = 0
+    table_count: int
 
 
 def parse_args(argv: Sequence[str]) -> argparse.Namespace:
@@ -77,11 +146,17 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
         default=INDEX_FILENAME,
         help=f"Index filename relative to the output directory (default: {INDEX_FILENAME}).",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconvert every guide even if its source document is unchanged.",
+    )
     return parser.parse_args(argv)
 
 
+@lru_cache(maxsize=1024)
 def slugify(text: str) -> str:
-    normalized = re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-")
+    normalized = _SLUG_RE.sub("-", text).strip("-")
     return normalized.lower()
 
 
@@ -103,40 +178,105 @@ def parse_metadata(doc_path: Path, output_dir: Path, course: CourseContext) -> G
         json_path=json_path,
         html_path=html_path,
         tags=list(course.tags),
+        table_count=0,
     )
 
 
-def extract_text(cell) -> str:
+def source_signature(meta: GuideMetadata) -> dict:
+    """Describe the source document so unchanged guides can be skipped.
+
+    Course tags are included because they are baked into the guide payload.
+    """
+    stat = meta.source_path.stat()
+    return {
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "courseTags": list(meta.course.tags),
+    }
+
+
+def read_existing_json(json_path: Path) -> dict:
+    """Load a previously generated guide or index JSON, or an empty dict if unavailable."""
+    if not json_path.exists():
+        return {}
+    try:
+        if orjson is not None:
+            return orjson.loads(json_path.read_bytes())
+        with json_path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (json.JSONDecodeError, IOError):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        return {}
+
+
+def load_cached_metadata(meta: GuideMetadata, existing_data: dict) -> GuideMetadata | None:
+    """Return metadata rebuilt from existing output if the source is unchanged."""
+    if not existing_data or not meta.html_path.exists():
+        return None
+
+    if existing_data.get("_source") != source_signature(meta):
+        return None
+
+    # Output written in an older cellData format is regenerated once.
+    if existing_data.get("_cellDataVersion") != CELL_DATA_VERSION:
+        return None
+
+    meta.tags = list(existing_data.get("tags", meta.tags))
+    meta.table_count = len(existing_data.get("tables", []))
+    return meta
+
+
+def extract_text(cell) -> tuple[str, str]:
+    """Return the cell text as HTML (escaped, lines joined by <br>) and as plain text."""
     lines: List[str] = []
-    for paragraph in cell.paragraphs:
-        text = "".join(run.text for run in paragraph.runs).strip()
+    # Walk the XML directly rather than allocating python-docx Paragraph/Run wrappers.
+    for p in cell._tc.iterchildren(_QN_P):
+        text = "".join(
+            str(element)
+            for r in p.iterchildren(_QN_R)
+            for element in r.iterchildren(*_RUN_TEXT_TAGS)
+        ).strip()
         if text:
             lines.append(text)
-    return "<br>".join(lines).strip()
+    return "<br>".join(escape(line, quote=False) for line in lines), "\n".join(lines)
 
 
-def convert_table(table) -> dict:
+def convert_table(grid: List[list]) -> tuple[dict, dict]:
+    """Convert a table's cell grid (see `table_grid`) to its JSON form plus a
+    plain-text twin for cellData."""
     headers: List[str] = []
     rows = []
-
-    if table.rows:
-        first_row = table.rows[0]
-        headers = [extract_text(cell) for cell in first_row.cells]
-
-        data_rows = table.rows[1:]
-        for row in data_rows:
-            rows.append([extract_text(cell) for cell in row.cells])
-
-    return {
-        "headers": headers,
-        "rows": rows,
-    }
+    plain_headers: List[str] = []
+    plain_rows = []
+
+    if grid:
+        for cell in grid[0]:
+            html_text, plain_text = extract_text(cell)
+            headers.append(html_text)
+            plain_headers.append(plain_text)
+
+        for cells in grid[1:]:
+            texts = [extract_text(cell) for cell in cells]
+            rows.append([html_text for html_text, _ in texts])
+            plain_rows.append([plain_text for _, plain_text in texts])
+
+    return (
+        {
+            "headers": headers,
+            "rows": rows,
+        },
+        {
+            "headers": plain_headers,
+            "rows": plain_rows,
+        },
+    )
 
 
-def extract_full_width_headers(document: Document) -> List[dict]:
-    """Extract headers that span the entire table width (full-width merged cells).
+def extract_full_width_headers(grid: List[list], table_idx: int) -> List[dict]:
+    """Extract header cells that span the entire table width (full-width merged cells).
     
-    Returns a list of tag info dictionaries with:
+    `grid` is the table's cell grid from `table_grid`. Returns a list of tag
+    info dictionaries with:
     - tag: normalized header text
     - tableIndex: 1-based table index
     - row: row index (0 for headers)
@@ -144,96 +284,98 @@ def extract_full_width_headers(document: Document) -> List[dict]:
     - cellId: cell ID for navigation
     """
     tags = []
-    seen_tags = set()  # Track unique tags to avoid duplicates
     
-    for table_idx, table in enumerate(document.tables, start=1):
-        if not table.rows:
-            continue
-        
-        # Get max columns in this table
-        max_columns = max(len(row.cells) for row in table.rows) if table.rows else 0
-        if max_columns == 0:
+    # Get max columns in this table
+    max_columns = max((len(cells) for cells in grid), default=0)
+    if max_columns == 0:
+        return tags
+    
+    # Check first row (header row) for full-width cells
+    rendered_cells = set()
+    
+    for col_idx, cell in enumerate(grid[0]):
+        cell_id = id(cell._tc)
+        if cell_id in rendered_cells:
             continue
+        rendered_cells.add(cell_id)
         
-        # Check first row (header row) for full-width cells
-        first_row = table.rows[0]
-        rendered_cells = set()
-        
-        for col_idx, cell in enumerate(first_row.cells):
-            cell_id = id(cell._tc)
-            if cell_id in rendered_cells:
-                continue
-            rendered_cells.add(cell_id)
-            
-            colspan = get_colspan(cell)
+        # Check if this cell spans the entire table width
+        if get_colspan(cell) == max_columns:
+            _, normalized = extract_text(cell)
             
-            # Check if this cell spans the entire table width
-            if colspan == max_columns:
-                cell_text = extract_text(cell)
-                # Normalize: remove HTML tags, strip whitespace
-                normalized = re.sub(r"<[^>]+>", "", cell_text).strip()
-                
-                if normalized and normalized != "&nbsp;":
-                    # Use normalized text as tag key to avoid duplicates
-                    tag_key = normalized.lower()
-                    if tag_key not in seen_tags:
-                        seen_tags.add(tag_key)
-                        cell_id_str = f"table_{table_idx}_row_0_col_{col_idx}"
-                        tags.append({
-                            "tag": normalized,
-                            "tableIndex": table_idx,
-                            "row": 0,
-                            "col": col_idx,
-                            "cellId": cell_id_str,
-                        })
+            if normalized and normalized != "&nbsp;":
+                tags.append({
+                    "tag": normalized,
+                    "tableIndex": table_idx,
+                    "row": 0,
+                    "col": col_idx,
+                    "cellId": f"table_{table_idx}_row_0_col_{col_idx}",
+                })
     
     return tags
 
 
-def generate_cell_data(tables: List[dict]) -> dict:
-    """Generate cellData structure for all non-empty cells in tables.
+def generate_cell_data(tables: List[dict]) -> List[tuple[str, str]]:
+    """Generate (cell_id, content) pairs for all non-empty cells in tables.
     
+    Expects the plain-text tables from convert_table, so content is stored as-is.
     Uses 1-based table indices to match HTML data-table-index attributes.
     """
-    cell_data = {}
+    cells: List[tuple[str, str]] = []
     
     for table_idx, table in enumerate(tables, start=1):  # Start at 1 to match HTML
         # Process headers (row 0)
         if table.get("headers"):
             for col_idx, header in enumerate(table["headers"]):
-                if header and header.strip() and header.strip() != "&nbsp;":
-                    cell_id = f"table_{table_idx}_row_0_col_{col_idx}"
-                    # Normalize content: remove HTML tags, strip whitespace
-                    normalized = re.sub(r"<[^>]+>", "", header).strip()
-                    if normalized:
-                        cell_data[cell_id] = {
-                            "content": normalized,
-                            "summary": "",
-                        }
+                if header and header != "&nbsp;":
+                    cells.append((f"table_{table_idx}_row_0_col_{col_idx}", header))
         
         # Process rows
         if table.get("rows"):
             for row_idx, row in enumerate(table["rows"], start=1):
                 for col_idx, cell in enumerate(row):
-                    if cell and cell.strip() and cell.strip() != "&nbsp;":
-                        cell_id = f"table_{table_idx}_row_{row_idx}_col_{col_idx}"
-                        # Normalize content: remove HTML tags, strip whitespace
-                        normalized = re.sub(r"<[^>]+>", "", cell).strip()
-                        if normalized:
-                            cell_data[cell_id] = {
-                                "content": normalized,
-                                "summary": "",
-                            }
+                    if cell and cell != "&nbsp;":
+                        cells.append((f"table_{table_idx}_row_{row_idx}_col_{col_idx}", cell))
     
-    return cell_data
+    return cells
 
 
-def convert_document(meta: GuideMetadata, document: Document) -> dict:
-    tables = [convert_table(table) for table in document.tables if table.rows]
+def convert_and_render(
+    meta: GuideMetadata,
+    document: Document,
+    existing: dict | None = None,
+) -> tuple[dict, str]:
+    """Build the JSON payload and HTML fragment in a single pass over the tables.
+
+    `existing` is the previously generated JSON for this guide; its summaries are
+    carried over into the new cellData.
+
+    HTML tables are numbered across every table in the document, while the JSON
+    `tables` list (and therefore cellData IDs) only counts tables with rows.
+    """
+    tables: List[dict] = []
+    plain_tables: List[dict] = []
+    table_parts: List[str] = []
+    tag_locations: List[dict] = []
+    seen_tags = set()  # Track unique tags to avoid duplicates
+    for index, table in enumerate(document.tables, start=1):
+        # Resolve the cell grid once; python-docx rebuilds it on every row.cells
+        grid = table_grid(table)
+        table_parts.append(render_table_html(table, index, grid))
+        if grid:
+            table_json, plain_table = convert_table(grid)
+            tables.append(table_json)
+            plain_tables.append(plain_table)
+            # Extract tags from full-width headers, keeping the first table
+            # each one appears in
+            for tag_info in extract_full_width_headers(grid, index):
+                tag_key = tag_info["tag"].lower()
+                if tag_key not in seen_tags:
+                    seen_tags.add(tag_key)
+                    tag_locations.append(tag_info)
     meta.table_count = len(tables)
+    html_fragment = build_html_fragment(meta, table_parts)
 
-    # Extract tags from full-width headers
-    tag_locations = extract_full_width_headers(document)
     # Extract unique tag names (combine with existing course tags)
     auto_tags = [tag_info["tag"] for tag_info in tag_locations]
     # Merge with existing course tags, preserving order and avoiding duplicates
@@ -245,67 +387,46 @@ def convert_document(meta: GuideMetadata, document: Document) -> dict:
             seen_tag_lower.add(tag.lower())
     meta.tags = all_tags
 
-    # Preserve existing cellData if JSON file already exists
-    existing_cell_data = {}
-    if meta.json_path.exists():
-        try:
-            with meta.json_path.open("r", encoding="utf-8") as fh:
-                existing_data = json.load(fh)
-                existing_cell_data = existing_data.get("cellData", {})
-        except (json.JSONDecodeError, IOError):
-            pass
-
-    # Generate new cellData for all non-empty cells
-    new_cell_data = generate_cell_data(tables)
-    
+    # Preserve existing cellData from the previously generated JSON
+    existing_cell_data = (existing or {}).get("cellData", {})
+
     # Build a content-to-summary map from existing data for migration
-    # This helps preserve summaries when cell IDs change (e.g., 0-based to 1-based indices)
-    content_to_summary = {}
-    for existing_entry in existing_cell_data.values():
-        content = existing_entry.get("content", "").strip()
-        summary = existing_entry.get("summary", "").strip()
-        if content and summary and summary != "no data":
-            # Use content as key (normalized)
-            normalized_content = re.sub(r"<[^>]+>", "", content).strip()
-            if normalized_content:
-                content_to_summary[normalized_content] = {
-                    "summary": summary,
-                    "lastUpdated": existing_entry.get("lastUpdated", ""),
-                }
+    # This helps preserve summaries when cell IDs change (e.g., 0-based to 1-based indices).
+    # Stored content was already normalized by generate_cell_data, so it is used as-is.
+    content_to_summary = {
+        entry.get("content", "").strip(): {
+            "summary": entry.get("summary", "").strip(),
+            "lastUpdated": entry.get("lastUpdated", ""),
+        }
+        for entry in existing_cell_data.values()
+        if entry.get("content", "").strip()
+        and entry.get("summary", "").strip() not in ("", "no data")
+    }
     
-    # Merge: preserve existing entries, add new ones
-    merged_cell_data = {**new_cell_data}
-    for cell_id, new_entry in new_cell_data.items():
+    # Build cellData for all non-empty cells, preserving existing summaries.
+    # cellData stays keyed by cell ID because the site and fetch_drug_summaries.py
+    # look entries up that way; the IDs repeat across guides, so intern them.
+    merged_cell_data = {}
+    for cell_id, content in generate_cell_data(plain_tables):
+        entry = {"content": content, "summary": ""}
         # First try to match by cell_id (exact match)
-        if cell_id in existing_cell_data:
-            existing_entry = existing_cell_data[cell_id]
+        existing_entry = existing_cell_data.get(cell_id)
+        if existing_entry is not None:
             if existing_entry.get("summary"):
-                merged_cell_data[cell_id]["summary"] = existing_entry["summary"]
+                entry["summary"] = existing_entry["summary"]
             if "lastUpdated" in existing_entry:
-                merged_cell_data[cell_id]["lastUpdated"] = existing_entry["lastUpdated"]
+                entry["lastUpdated"] = existing_entry["lastUpdated"]
         else:
             # If cell_id doesn't match, try to match by content (for index migration)
-            content = new_entry.get("content", "").strip()
-            normalized_content = re.sub(r"<[^>]+>", "", content).strip()
-            if normalized_content in content_to_summary:
+            matched_data = content_to_summary.get(content)
+            if matched_data:
                 # Found a match by content - migrate the summary
-                matched_data = content_to_summary[normalized_content]
-                merged_cell_data[cell_id]["summary"] = matched_data["summary"]
+                entry["summary"] = matched_data["summary"]
                 if matched_data.get("lastUpdated"):
-                    merged_cell_data[cell_id]["lastUpdated"] = matched_data["lastUpdated"]
-
-    if not tables:
-        return {
-            "title": meta.title,
-            "course": meta.course.name,
-            "courseSlug": meta.course.slug,
-            "tags": meta.tags,
-            "tagLocations": tag_locations,
-            "tables": [],
-            "cellData": merged_cell_data,
-        }
+                    entry["lastUpdated"] = matched_data["lastUpdated"]
+        merged_cell_data[sys.intern(cell_id)] = entry
 
-    return {
+    payload = {
         "title": meta.title,
         "course": meta.course.name,
         "courseSlug": meta.course.slug,
@@ -313,15 +434,13 @@ def convert_document(meta: GuideMetadata, document: Document) -> dict:
         "tagLocations": tag_locations,
         "tables": tables,
         "cellData": merged_cell_data,
+        "_cellDataVersion": CELL_DATA_VERSION,
+        "_source": source_signature(meta),
     }
+    return payload, html_fragment
 
 
-def build_html_fragment(meta: GuideMetadata, document: Document) -> str:
-    table_parts: List[str] = []
-
-    for index, table in enumerate(document.tables, start=1):
-        table_parts.append(render_table_html(table, index))
-
+def build_html_fragment(meta: GuideMetadata, table_parts: List[str]) -> str:
     if not table_parts:
         table_parts.append(
             '<p class="guide-empty">No tables were found in this guide.</p>'
@@ -331,58 +450,63 @@ def build_html_fragment(meta: GuideMetadata, document: Document) -> str:
     return f'<section class="guide-fragment" data-guide="{meta.slug}">\n{inner_html}\n</section>'
 
 
-def render_table_html(table, index: int) -> str:
-    rows_html: List[str] = []
-    max_columns = max(len(row.cells) for row in table.rows) if table.rows else 0
+def render_table_html(table, index: int, grid: List[list] | None = None) -> str:
+    if grid is None:
+        grid = table_grid(table)
+    max_columns = max((len(cells) for cells in grid), default=0)
+    rowspans = _compute_rowspans(grid)
 
-    for row_idx, row in enumerate(table.rows):
+    table_attrs = [
+        f'class="guide-table guide-table-{index}"',
+        f'data-table-index="{index}"',
+    ]
+    if max_columns:
+        table_attrs.append(f'data-columns="{max_columns}"')
+    table_style = collect_table_styles(table)
+    if table_style:
+        table_attrs.append(f'style="{table_style}"')
+
+    parts: List[str] = [f"<table {' '.join(table_attrs)}>"]
+    has_rows = False
+
+    for row_idx, cells in enumerate(grid):
         cell_tag = "th" if row_idx == 0 else "td"
         rendered_cells = set()
-        cell_chunks: List[str] = []
+        row_start = len(parts)
+        parts.append("\n  <tr>")
 
-        for col_idx, cell in enumerate(row.cells):
+        for col_idx, cell in enumerate(cells):
             cell_id = id(cell._tc)
             if cell_id in rendered_cells:
                 continue
             rendered_cells.add(cell_id)
 
-            rowspan = get_rowspan(table, row_idx, col_idx, cell)
+            rowspan = rowspans.get((row_idx, col_idx), 1)
             if rowspan == 0:
                 continue
             colspan = get_colspan(cell)
 
-            cell_styles = collect_cell_styles(cell)
-            style_attr = f' style="{cell_styles}"' if cell_styles else ""
-
-            attrs: List[str] = []
+            parts.append(f"\n    <{cell_tag}")
             if colspan > 1:
-                attrs.append(f'colspan="{colspan}"')
+                parts.append(f' colspan="{colspan}"')
             if rowspan > 1:
-                attrs.append(f'rowspan="{rowspan}"')
-            if style_attr:
-                attrs.append(style_attr.strip())
-
-            cell_html = render_cell_html(cell)
-            attr_string = (" " + " ".join(attrs)) if attrs else ""
-            cell_chunks.append(f"    <{cell_tag}{attr_string}>{cell_html}</{cell_tag}>")
-
-        if cell_chunks:
-            rows_html.append("  <tr>\n" + "\n".join(cell_chunks) + "\n  </tr>")
+                parts.append(f' rowspan="{rowspan}"')
+            cell_styles = collect_cell_styles(cell)
+            if cell_styles:
+                parts.append(f' style="{cell_styles}"')
+            parts.append(f">{render_cell_html(cell)}</{cell_tag}>")
 
-    table_attrs = [
-        f'class="guide-table guide-table-{index}"',
-        f'data-table-index="{index}"',
-    ]
-    if max_columns:
-        table_attrs.append(f'data-columns="{max_columns}"')
-    table_style = collect_table_styles(table)
-    if table_style:
-        table_attrs.append(f'style="{table_style}"')
+        if len(parts) == row_start + 1:
+            # No cells were rendered for this row, so drop its opening tag.
+            del parts[row_start:]
+            continue
+        parts.append("\n  </tr>")
+        has_rows = True
 
-    return "<table {attrs}>\n{rows}\n</table>".format(
-        attrs=" ".join(table_attrs),
-        rows="\n".join(rows_html),
-    )
+    if not has_rows:
+        parts.append("\n")
+    parts.append("\n</table>")
+    return "".join(parts)
 
 
 def render_cell_html(cell) -> str:
@@ -394,6 +518,47 @@ def render_cell_html(cell) -> str:
     return merged_text or "&nbsp;"
 
 
+def _xml_child(parent, tag: str):
+    if parent is None:
+        return None
+    return parent.find(tag)
+
+
+def _xml_attr(parent, tag: str, attr: str = _QN_VAL) -> str | None:
+    """Read `attr` from the `tag` child of `parent`, or None if either is missing.
+
+    `tag` and `attr` are Clark-notation names such as the `_QN_*` constants.
+    """
+    child = _xml_child(parent, tag)
+    if child is None:
+        return None
+    return child.get(attr)
+
+
+def _xml_on_off(parent, tag: str) -> bool:
+    """Evaluate a w:b / w:i style toggle; a bare element means "on"."""
+    child = _xml_child(parent, tag)
+    if child is None:
+        return False
+    return child.get(_QN_VAL) not in ("0", "false", "off")
+
+
+def _xml_rgb(parent) -> str | None:
+    value = _xml_attr(parent, _QN_COLOR)
+    if not value or value == "auto":
+        return None
+    return value.upper()
+
+
+def _xml_twips(value: str | None) -> Length | None:
+    if value is None:
+        return None
+    try:
+        return Twips(int(value))
+    except ValueError:
+        return None
+
+
 def render_paragraph_html(paragraph) -> str:
     runs_html = []
     for run in paragraph.runs:
@@ -406,44 +571,49 @@ def render_paragraph_html(paragraph) -> str:
         text_html = "&nbsp;"
 
     styles: List[str] = []
-    alignment = paragraph.alignment
-    if alignment is not None:
-        if alignment == WD_ALIGN_PARAGRAPH.CENTER:
-            styles.append("text-align: center;")
-        elif alignment == WD_ALIGN_PARAGRAPH.RIGHT:
-            styles.append("text-align: right;")
-        elif alignment == WD_ALIGN_PARAGRAPH.JUSTIFY:
-            styles.append("text-align: justify;")
-
-    para_font = getattr(paragraph.style, "font", None) if paragraph.style else None
-    if para_font is not None:
-        size = getattr(para_font, "size", None)
-        if size and hasattr(size, "pt"):
-            styles.append(f"font-size: {size.pt:.2f}pt;")
-
-        font_color = getattr(para_font, "color", None)
-        if font_color and font_color.rgb:
-            styles.append(f"color: #{font_color.rgb};")
-
-    para_format = paragraph.paragraph_format
-    if para_format is not None:
-        before = getattr(para_format, "space_before", None)
-        after = getattr(para_format, "space_after", None)
-        line_space = getattr(para_format, "line_spacing", None)
-        if before and hasattr(before, "pt"):
+    p_pr = _xml_child(paragraph._p, _QN_PPR)
+    alignment = _xml_attr(p_pr, _QN_JC)
+    if alignment == "center":
+        styles.append("text-align: center;")
+    elif alignment == "right":
+        styles.append("text-align: right;")
+    elif alignment == "both":
+        styles.append("text-align: justify;")
+
+    style = paragraph.style
+    if style is not None:
+        style_r_pr = _xml_child(style.element, _QN_RPR)
+        size = _xml_attr(style_r_pr, _QN_SZ)
+        if size and size.isdigit() and int(size):
+            styles.append(f"font-size: {int(size) / 2:.2f}pt;")
+
+        font_color = _xml_rgb(style_r_pr)
+        if font_color:
+            styles.append(f"color: #{font_color};")
+
+    spacing = _xml_child(p_pr, _QN_SPACING)
+    if spacing is not None:
+        before = _xml_twips(spacing.get(_QN_BEFORE))
+        after = _xml_twips(spacing.get(_QN_AFTER))
+        line_space = _xml_twips(spacing.get(_QN_LINE))
+        if before:
             styles.append(f"margin-top: {before.pt:.2f}pt;")
-        if after and hasattr(after, "pt"):
+        if after:
             styles.append(f"margin-bottom: {after.pt:.2f}pt;")
-        if line_space and isinstance(line_space, (int, float)):
+        if line_space:
+            # Matches python-docx: "auto" (or no) lineRule means a multiple of lines,
+            # anything else is an absolute Length rendered as its raw EMU value.
+            if spacing.get(_QN_LINE_RULE) in (None, "auto"):
+                line_space = line_space / Pt(12)
             styles.append(f"line-height: {line_space};")
 
     class_names: List[str] = []
-    if paragraph.style and paragraph.style.name:
-        sanitized_name = slugify(paragraph.style.name)
+    if style is not None and style.name:
+        sanitized_name = slugify(style.name)
         if sanitized_name:
             class_names.append(f"para-{sanitized_name}")
 
-    if paragraph._p.pPr is not None and paragraph._p.pPr.numPr is not None:
+    if _xml_child(p_pr, _QN_NUMPR) is not None:
         class_names.append("para-list")
 
     class_attr = f' class="{" ".join(class_names)}"' if class_names else ""
@@ -461,28 +631,29 @@ def render_run_html(run) -> str:
 
     open_tags: List[str] = []
     close_tags: List[str] = []
+    r_pr = _xml_child(run._r, _QN_RPR)
 
-    if run.bold:
+    if _xml_on_off(r_pr, _QN_B):
         open_tags.append("<strong>")
         close_tags.insert(0, "</strong>")
 
-    if run.italic:
+    if _xml_on_off(r_pr, _QN_I):
         open_tags.append("<em>")
         close_tags.insert(0, "</em>")
 
-    if run.underline:
+    if _xml_attr(r_pr, _QN_U) not in (None, "none"):
         open_tags.append('<span style="text-decoration: underline;">')
         close_tags.insert(0, "</span>")
 
     style_bits: List[str] = []
-    if run.font and run.font.color and run.font.color.rgb:
-        style_bits.append(f"color: #{run.font.color.rgb};")
+    color = _xml_rgb(r_pr)
+    if color:
+        style_bits.append(f"color: #{color};")
 
-    if run.font and run.font.highlight_color:
-        highlight_key = getattr(run.font.highlight_color, "name", str(run.font.highlight_color))
-        highlight = COLOR_INDEX_TO_HEX.get(highlight_key)
-        if highlight:
-            style_bits.append(f"background-color: {highlight};")
+    highlight_key = HIGHLIGHT_XML_TO_NAME.get(_xml_attr(r_pr, _QN_HIGHLIGHT))
+    highlight = COLOR_INDEX_TO_HEX.get(highlight_key)
+    if highlight:
+        style_bits.append(f"background-color: {highlight};")
 
     if style_bits:
         open_tags.append(f'<span style="{" ".join(style_bits)}">')
@@ -491,6 +662,8 @@ def render_run_html(run) -> str:
     return "".join(open_tags) + text + "".join(close_tags)
 
 
+HIGHLIGHT_XML_TO_NAME = {member.xml_value: member.name for member in WD_COLOR_INDEX}
+
 COLOR_INDEX_TO_HEX = {
     "YELLOW": "#fff200",
     "TURQUOISE": "#00a8e8",
@@ -555,58 +728,101 @@ def get_colspan(cell) -> int:
         return 1
 
 
-def get_rowspan(table, row_idx: int, col_idx: int, cell) -> int:
+def table_grid(table) -> List[list]:
+    """Return `row.cells` for every row while resolving the cell grid only once.
+
+    python-docx rebuilds the whole grid on each `row.cells` access, which makes
+    per-row access quadratic in the table size.
+
+    Relies on the private `Table._cells` and `Table._column_count` of
+    python-docx 1.1.0 (the version pinned in requirements.txt), which lay the
+    grid out row by row exactly as `row.cells` does. Re-check this helper
+    whenever that pin is bumped.
+    """
+    cells = table._cells
+    column_count = table._column_count
+    return [
+        cells[row_idx * column_count:(row_idx + 1) * column_count]
+        for row_idx in range(len(table.rows))
+    ]
+
+
+def _vmerge_val(cell) -> str | None:
+    """Return "restart"/"continue" for vertically merged cells, None otherwise."""
     tc_pr = getattr(cell._tc, "tcPr", None)
     if tc_pr is None or tc_pr.vMerge is None:
-        return 1
+        return None
+    return tc_pr.vMerge.val or "continue"
 
-    v_val = tc_pr.vMerge.val
-    if v_val is not None and v_val != "restart":
-        return 0
-
-    span = 1
-    next_row_idx = row_idx + 1
-    while next_row_idx < len(table.rows):
-        try:
-            next_cell = table.rows[next_row_idx].cells[col_idx]
-        except IndexError:
-            break
-        next_tc_pr = getattr(next_cell._tc, "tcPr", None)
-        if next_tc_pr is None or next_tc_pr.vMerge is None:
-            break
-        next_val = next_tc_pr.vMerge.val
-        if next_val not in (None, "continue"):
-            break
-        span += 1
-        next_row_idx += 1
-    return span
 
+def _compute_rowspans(grid: List[list]) -> dict[tuple[int, int], int]:
+    """Map (row, col) of vertically merged cells to their rowspan.
+
+    Continuation cells map to 0 so they are skipped. Unmerged cells are absent
+    and default to a span of 1. Each column is walked once, bottom-up.
+    """
+    spans: dict[tuple[int, int], int] = {}
+    max_columns = max((len(row) for row in grid), default=0)
+
+    for col_idx in range(max_columns):
+        # Length of the run of continuation cells starting just below the current row.
+        continued_below = 0
+        for row_idx in range(len(grid) - 1, -1, -1):
+            row = grid[row_idx]
+            if col_idx >= len(row):
+                continued_below = 0
+                continue
+            v_val = _vmerge_val(row[col_idx])
+            if v_val is None:
+                continued_below = 0
+                continue
+            if v_val == "restart":
+                spans[(row_idx, col_idx)] = 1 + continued_below
+                continued_below = 0
+            else:
+                spans[(row_idx, col_idx)] = 0
+                continued_below += 1
+
+    return spans
 
-def get_cell_borders(cell) -> dict[str, str]:
-    tc_pr = getattr(cell._tc, "tcPr", None)
-    if tc_pr is None:
-        return {}
 
+def _xml_sides(elements: Iterable) -> dict:
+    """Map side names (top, left, insideH, ...) to the first element for each side."""
+    sides: dict = {}
+    for element in elements:
+        side = _SIDE_BY_QN.get(element.tag)
+        if side is not None:
+            sides.setdefault(side, element)
+    return sides
+
+
+def _border_css(border) -> str:
+    style_key = border.get(_QN_VAL)
+    border_style = BORDER_STYLE_MAP.get(style_key, "solid")
+    size_raw = border.get(_QN_SZ)
     try:
-        tc_borders = tc_pr.tcBorders
-    except AttributeError:
-        tc_borders = None
+        size_value = int(size_raw) if size_raw is not None else None
+    except (TypeError, ValueError):
+        size_value = None
+    size_pt = eighth_pt_to_pt(size_value)
+    width_part = f"{size_pt:.2f}pt" if size_pt else "1pt"
+    color = border.get(_QN_COLOR)
+    color_part = f"#{color}" if color and color != "auto" else "#13294b"
+    return f"{width_part} {border_style} {color_part}"
 
-    if tc_borders is None:
-        borders_el = tc_pr.xpath("./w:tcBorders")
-        tc_borders = borders_el[0] if borders_el else None
 
-    if tc_borders is None:
-        return {}
+def _margin_pt(margin) -> float | None:
+    value = margin.get(_QN_W)
+    if value is None:
+        return None
+    try:
+        return twips_to_pt(int(value))
+    except (TypeError, ValueError):
+        return None
 
-    def get_border_element(border_container, side_name):
-        if hasattr(border_container, side_name):
-            try:
-                return getattr(border_container, side_name)
-            except AttributeError:
-                pass
-        return border_container.find(qn(f"w:{side_name}")) if hasattr(border_container, "find") else None
 
+def get_cell_borders(cell) -> dict[str, str]:
+    sides = _xml_sides(_CELL_BORDERS_XPATH(cell._tc))
     borders = {}
     border_map = {
         "top": "border-top",
@@ -615,44 +831,18 @@ def get_cell_borders(cell) -> dict[str, str]:
         "right": "border-right",
     }
     for side, css_name in border_map.items():
-        border = get_border_element(tc_borders, side)
+        border = sides.get(side)
         if border is None:
             continue
-        style_key = getattr(border, "val", None) if hasattr(border, "val") else border.get(qn("w:val"))
-        if style_key in ("nil", "none"):
+        if border.get(_QN_VAL) in ("nil", "none"):
             borders[css_name] = "none"
             continue
-        border_style = BORDER_STYLE_MAP.get(style_key, "solid")
-        size_raw = getattr(border, "sz", None) if hasattr(border, "sz") else border.get(qn("w:sz"))
-        try:
-            size_value = int(size_raw) if size_raw is not None else None
-        except (TypeError, ValueError):
-            size_value = None
-        size_pt = eighth_pt_to_pt(size_value)
-        width_part = f"{size_pt:.2f}pt" if size_pt else "1pt"
-        color = getattr(border, "color", None) if hasattr(border, "color") else border.get(qn("w:color"))
-        color_part = f"#{color}" if color and color != "auto" else "#13294b"
-        borders[css_name] = f"{width_part} {border_style} {color_part}"
+        borders[css_name] = _border_css(border)
     return borders
 
 
 def get_cell_padding(cell) -> dict[str, str]:
-    tc_pr = getattr(cell._tc, "tcPr", None)
-    if tc_pr is None:
-        return {}
-
-    try:
-        tc_mar = tc_pr.tcMar
-    except AttributeError:
-        tc_mar = None
-
-    if tc_mar is None and tc_pr is not None:
-        mar_elems = tc_pr.xpath("./w:tcMar")
-        tc_mar = mar_elems[0] if mar_elems else None
-
-    if tc_mar is None:
-        return {}
-
+    sides = _xml_sides(_CELL_MARGINS_XPATH(cell._tc))
     padding = {}
     margin_map = {
         "top": "padding-top",
@@ -661,20 +851,10 @@ def get_cell_padding(cell) -> dict[str, str]:
         "right": "padding-right",
     }
     for side, css_name in margin_map.items():
-        if hasattr(tc_mar, side):
-            margin = getattr(tc_mar, side, None)
-        else:
-            margin = tc_mar.find(qn(f"w:{side}")) if hasattr(tc_mar, "find") else None
+        margin = sides.get(side)
         if margin is None:
             continue
-        value = getattr(margin, "w", None) if hasattr(margin, "w") else margin.get(qn("w:w"))
-        if value is None:
-            continue
-        try:
-            value_int = int(value)
-        except (TypeError, ValueError):
-            continue
-        pt_value = twips_to_pt(value_int)
+        pt_value = _margin_pt(margin)
         if pt_value is not None:
             padding[css_name] = f"{pt_value:.2f}pt"
     return padding
@@ -697,68 +877,28 @@ def collect_cell_styles(cell) -> str:
 
 def collect_table_styles(table) -> str:
     styles: List[str] = ["border-collapse: collapse"]
-    tbl_pr = getattr(table._tbl, "tblPr", None)
-    tbl_borders = None
-    if tbl_pr is not None:
-        try:
-            tbl_borders = tbl_pr.tblBorders
-        except AttributeError:
-            borders_el = tbl_pr.xpath("./w:tblBorders")
-            tbl_borders = borders_el[0] if borders_el else None
-
-    if tbl_borders is not None:
-        border_values = []
-        for side in ("top", "bottom", "left", "right", "insideH", "insideV"):
-            if hasattr(tbl_borders, side):
-                border = getattr(tbl_borders, side, None)
-            else:
-                border = tbl_borders.find(qn(f"w:{side}")) if hasattr(tbl_borders, "find") else None
-            if border is None:
-                continue
-            style_key = getattr(border, "val", None) if hasattr(border, "val") else border.get(qn("w:val"))
-            if style_key in ("nil", "none"):
-                continue
-            css_style = BORDER_STYLE_MAP.get(style_key, "solid")
-            raw_size = getattr(border, "sz", None) if hasattr(border, "sz") else border.get(qn("w:sz"))
-            size_pt = eighth_pt_to_pt(int(raw_size)) if raw_size is not None else None
-            width_part = f"{size_pt:.2f}pt" if size_pt else "1pt"
-            color = getattr(border, "color", None) if hasattr(border, "color") else border.get(qn("w:color"))
-            color_part = f"#{color}" if color and color != "auto" else "#13294b"
-            border_values.append(f"{width_part} {css_style} {color_part}")
-        if border_values:
-            styles.append(f"border: {border_values[0]}")
-
-    tbl_cell_mar = None
-    if tbl_pr is not None:
-        try:
-            tbl_cell_mar = tbl_pr.tblCellMar
-        except AttributeError:
-            mar_el = tbl_pr.xpath("./w:tblCellMar")
-            tbl_cell_mar = mar_el[0] if mar_el else None
-
-    if tbl_cell_mar is not None:
-        spacing_values = []
-        for side in ("top", "bottom", "left", "right"):
-            if hasattr(tbl_cell_mar, side):
-                margin = getattr(tbl_cell_mar, side, None)
-            else:
-                margin = tbl_cell_mar.find(qn(f"w:{side}")) if hasattr(tbl_cell_mar, "find") else None
-            if margin is None:
-                continue
-            value = margin.w if hasattr(margin, "w") else margin.get(qn("w:w"), None) if hasattr(margin, "get") else None
-            if value is None:
-                continue
-            if hasattr(value, "val"):
-                value = value.val
-            try:
-                value_int = int(value)
-            except (TypeError, ValueError):
-                continue
-            pt_value = twips_to_pt(value_int)
-            if pt_value is not None:
-                spacing_values.append(pt_value)
-        if spacing_values:
-            styles.append(f"border-spacing: {max(spacing_values):.2f}pt")
+
+    border_sides = _xml_sides(_TABLE_BORDERS_XPATH(table._tbl))
+    border_values = []
+    for side in ("top", "bottom", "left", "right", "insideH", "insideV"):
+        border = border_sides.get(side)
+        if border is None or border.get(_QN_VAL) in ("nil", "none"):
+            continue
+        border_values.append(_border_css(border))
+    if border_values:
+        styles.append(f"border: {border_values[0]}")
+
+    margin_sides = _xml_sides(_TABLE_MARGINS_XPATH(table._tbl))
+    spacing_values = []
+    for side in ("top", "bottom", "left", "right"):
+        margin = margin_sides.get(side)
+        if margin is None:
+            continue
+        pt_value = _margin_pt(margin)
+        if pt_value is not None:
+            spacing_values.append(pt_value)
+    if spacing_values:
+        styles.append(f"border-spacing: {max(spacing_values):.2f}pt")
 
     return build_style_string(styles)
 
@@ -785,7 +925,7 @@ def get_cell_background(cell) -> str | None:
         return None
     shd_elems = tc_pr.xpath("./w:shd")
     if shd_elems:
-        fill = shd_elems[0].get(qn("w:fill"))
+        fill = shd_elems[0].get(_QN_FILL)
         if fill and fill != "auto":
             return f"#{fill}"
     return None
@@ -816,6 +956,11 @@ def get_cell_vertical_alignment(cell) -> str | None:
 
 def write_json(path: Path, payload: dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        with path.open("wb") as fh:
+            fh.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+
     with path.open("w", encoding="utf-8") as fh:
         json.dump(payload, fh, ensure_ascii=False, indent=2)
         fh.write("\n")
@@ -833,26 +978,37 @@ def update_index(
     output_dir: Path,
     index_filename: str,
     entries: Iterable[GuideMetadata],
-) -> None:
+) -> bool:
+    """Write the guide index, returning False if it was already up to date.
+
+    The index is rebuilt from this run's entries so removed guides drop out, but
+    the file (and its `generated` timestamp) is left alone when nothing changed.
+    """
+    index_path = output_dir / index_filename
+    guides = [
+        {
+            "title": meta.title,
+            "course": meta.course.name,
+            "courseSlug": meta.course.slug,
+            "tags": meta.tags,
+            "slug": meta.slug,
+            "dataFile": meta.json_path.name,
+            "fragment": meta.html_path.relative_to(output_dir).as_posix(),
+            "sourceFile": str(meta.source_path),
+            "tables": meta.table_count,
+        }
+        for meta in sorted(entries, key=lambda m: (m.title.lower(), m.slug))
+    ]
+
+    if read_existing_json(index_path).get("guides") == guides:
+        return False
+
     index_payload = {
         "generated": dt.datetime.now(dt.timezone.utc).strftime(DATE_FORMAT),
-        "guides": [
-            {
-                "title": meta.title,
-                "course": meta.course.name,
-                "courseSlug": meta.course.slug,
-                "tags": meta.tags,
-                "slug": meta.slug,
-                "dataFile": meta.json_path.name,
-                "fragment": meta.html_path.relative_to(output_dir).as_posix(),
-                "sourceFile": str(meta.source_path),
-                "tables": meta.table_count,
-            }
-            for meta in sorted(entries, key=lambda m: m.title.lower())
-        ],
+        "guides": guides,
     }
-
-    write_json(output_dir / index_filename, index_payload)
+    write_json(index_path, index_payload)
+    return True
 
 
 def read_course_tags(course_dir: Path) -> List[str]:
@@ -900,6 +1056,31 @@ def discover_courses(source_dir: Path) -> List[CourseContext]:
     return courses
 
 
+def process_one(
+    doc_path: Path,
+    course: CourseContext,
+    existing: dict,
+    output_dir: Path,
+) -> GuideMetadata:
+    """Convert a single guide and write its JSON and HTML outputs.
+
+    Runs inside a worker process, so everything passed in and returned must be
+    picklable.
+    """
+    # Read the archive in one go so python-docx's zip access hits memory, not disk.
+    document = Document(io.BytesIO(doc_path.read_bytes()))
+    meta = parse_metadata(doc_path, output_dir, course)
+    payload, html_fragment = convert_and_render(meta, document, existing=existing)
+
+    # Leave the fragment untouched when its content has not changed since last run.
+    html_hash = hashlib.blake2b(html_fragment.encode("utf-8"), digest_size=16).hexdigest()
+    payload["_htmlHash"] = html_hash
+    write_json(meta.json_path, payload)
+    if existing.get("_htmlHash") != html_hash or not meta.html_path.exists():
+        write_html(meta.html_path, html_fragment)
+    return meta
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_args(argv or sys.argv[1:])
 
@@ -916,6 +1097,9 @@ def main(argv: Sequence[str] | None = None) -> int:
         return 1
 
     metadata_entries: List[GuideMetadata] = []
+    doc_paths: List[Path] = []
+    doc_courses: List[CourseContext] = []
+    doc_existing: List[dict] = []
 
     for course in courses:
         documents = sorted(course.path.glob("*.docx"))
@@ -924,27 +1108,37 @@ def main(argv: Sequence[str] | None = None) -> int:
             continue
 
         for doc_path in documents:
-            document = Document(doc_path)
             meta = parse_metadata(doc_path, output_dir, course)
-            payload = convert_document(meta, document)
-            write_json(meta.json_path, payload)
-
-            html_fragment = build_html_fragment(meta, document)
-            write_html(meta.html_path, html_fragment)
-
-            metadata_entries.append(meta)
-            print(
-                f"Converted {doc_path.relative_to(course.path)} -> {meta.json_path.name} "
-                f"and {meta.html_path.relative_to(output_dir)} ({meta.table_count} tables) "
-                f"[course={course.name}]"
-            )
+            existing = read_existing_json(meta.json_path)
+            if not args.force:
+                cached = load_cached_metadata(meta, existing)
+                if cached is not None:
+                    metadata_entries.append(cached)
+                    print(f"Unchanged {doc_path.relative_to(course.path)} -> {cached.json_path.name} [course={course.name}]")
+                    continue
+            doc_paths.append(doc_path)
+            doc_courses.append(course)
+            doc_existing.append(existing)
+
+    if doc_paths:
+        convert = partial(process_one, output_dir=output_dir)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for meta in executor.map(convert, doc_paths, doc_courses, doc_existing):
+                metadata_entries.append(meta)
+                print(
+                    f"Converted {meta.source_path.relative_to(meta.course.path)} -> {meta.json_path.name} "
+                    f"and {meta.html_path.relative_to(output_dir)} ({meta.table_count} tables) "
+                    f"[course={meta.course.name}]"
+                )
 
     if not metadata_entries:
         print("No guides converted. Ensure each course folder contains .docx files.", file=sys.stderr)
         return 1
 
-    update_index(output_dir, args.index, metadata_entries)
-    print(f"Updated index at {output_dir / args.index}")
+    if update_index(output_dir, args.index, metadata_entries):
+        print(f"Updated index at {output_dir / args.index}")
+    else:
+        print(f"Index unchanged at {output_dir / args.index}")
     return 0
 
 
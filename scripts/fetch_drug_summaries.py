@@ -16,22 +16,90 @@ This script:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import os
 import re
+import sqlite3
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import quote, urljoin
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # Optional: fall back to the standard library json module.
+    orjson = None
 
 # Get the script's directory to resolve relative paths
 SCRIPT_DIR = Path(__file__).parent.resolve()
 DEFAULT_INPUT = SCRIPT_DIR.parent / "data"
+INDEX_FILENAME = "guides.index.json"
+# Lookup cache, kept next to this script rather than in the published data directory
+WIKI_CACHE_FILENAME = ".wiki_cache.db"
+# Failed lookups are retried sooner than found summaries are refreshed
+NEGATIVE_CACHE_TTL_DAYS = 7.0
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+# Guides at this cellData version (see convert_guides.py) store normalized content
+CELL_DATA_VERSION = 2
+# Sidecar next to each guide that records fetched summaries until they are saved
+JOURNAL_SUFFIX = ".summaries.jsonl"
+
+# MediaWiki Action API, used to look up many titles per request
+WIKIPEDIA_ACTION_API = "https://en.wikipedia.org/w/api.php"
+# TextExtracts returns at most 20 intro extracts per query
+WIKIPEDIA_BATCH_SIZE = 20
+SUMMARY_MAX_CHARS = 500
+USER_AGENT = "DrugGuideScraper/1.0"
+DEFAULT_CONCURRENCY = 10
+# Idle connections are kept this long (seconds), well past any --delay gap
+KEEPALIVE_EXPIRY = 30.0
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_PAREN_RE = re.compile(r"\s*\([^)]+\)")
+_CELL_ID_RE = re.compile(r"table_\d+_row_\d+_col_\d+")
+
+# Common column headers that never have a Wikipedia article worth showing
+_HEADER_DENY = frozenset({
+    "mechanism",
+    "class",
+    "notes",
+    "drug",
+    "drugs",
+    "side effects",
+    "adverse effects",
+    "indication",
+    "indications",
+    "contraindications",
+    "interactions",
+    "monitoring",
+    "dose",
+    "dosage",
+    "route",
+    "name",
+    "generic name",
+    "brand name",
+    "category",
+    "type",
+})
+# Page and table references ("see p. 42", "Table 3") and bare doses ("500 mg")
+_NON_DRUG_RE = re.compile(
+    r"(?:see\s+)?(?:pp?\.|page|table|fig\.?|figure)\s*\d+[a-z]?"
+    r"|see\s+.+"
+    r"|\d+(?:\.\d+)?\s*(?:mg|mcg|µg|g|kg|ml|l|units?|iu)(?:/\w+)?",
+    re.IGNORECASE,
+)
 
-# Wikipedia API base URL
-WIKIPEDIA_API_BASE = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -59,38 +127,60 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         "--delay",
         type=float,
         default=1.0,
-        help="Delay between requests in seconds (default: 1.0).",
+        help="Minimum delay between requests in seconds (default: 1.0).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum number of Wikipedia requests in flight at once (default: {DEFAULT_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--cache-ttl-days",
+        type=float,
+        default=30.0,
+        help="Re-fetch Wikipedia lookups cached longer ago than this (default: 30).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Number of guides to process in parallel (default: 1). All guides share "
+        "the --delay and --concurrency limits.",
     )
     return parser.parse_args(argv or sys.argv[1:])
 
 
 def is_likely_drug_name(text: str) -> bool:
-    """Check if text is non-empty - in a drug guide, everything is a drug or topic."""
-    if not text or len(text.strip()) < 2:
-        return False
-    
-    text = text.strip()
-    
-    # Skip empty or whitespace-only
-    if not text or text == "&nbsp;":
-        return False
-    
-    # In a drug guide, every non-empty cell is a drug or topic worth searching
-    return True
+    """Check if normalized content is worth looking up.
+
+    In a drug guide every non-empty cell is a drug or topic, except for column
+    headers. `text` comes from `normalize_content_for_storage`, which already
+    strips it and maps `&nbsp;` to "".
+    """
+    return (
+        len(text) >= 2
+        # Numbers, punctuation and symbol-font glyphs never name an article
+        and any(c.isalpha() for c in text)
+        and text.lower() not in _HEADER_DENY
+        and _NON_DRUG_RE.fullmatch(text) is None
+    )
 
 
+@lru_cache(maxsize=4096)
 def normalize_content_for_storage(content: str) -> str:
-    """Normalize content exactly as convert_guides.py does for storage in cellData.
+    """Normalize content for storage in cellData.
     
-    This matches the normalization used in generate_cell_data():
+    Only needed for guides converted before cellData version 2, whose content
+    may still contain markup:
     - Remove HTML tags
     - Strip whitespace
     - Handle &nbsp; as empty
     """
     if not content:
         return ""
-    # Remove HTML tags (same regex as convert_guides.py)
-    normalized = re.sub(r"<[^>]+>", "", content)
+    # Remove HTML tags (same regex as convert_guides.py); most cells have none
+    normalized = _HTML_TAG_RE.sub("", content) if "<" in content else content
     # Strip whitespace
     normalized = normalized.strip()
     # Handle &nbsp; as empty
@@ -99,6 +189,7 @@ def normalize_content_for_storage(content: str) -> str:
     return normalized
 
 
+@lru_cache(maxsize=4096)
 def normalize_drug_name(name: str) -> str:
     """Normalize drug name for Wikipedia lookup."""
     # First normalize as stored in cellData
@@ -107,112 +198,354 @@ def normalize_drug_name(name: str) -> str:
         return ""
     
     # Remove brand names in parentheses (for Wikipedia lookup only)
-    name = re.sub(r"\s*\([^)]+\)", "", name)
-    # Strip whitespace again after removing parentheses
-    name = name.strip()
+    if "(" in name:
+        name = _PAREN_RE.sub("", name)
+        # Strip whitespace again after removing parentheses
+        name = name.strip()
     
     # Always convert to title case for Wikipedia (article titles use title case)
     # This handles: "ANTIBACTERIALS" -> "Antibacterials", "antibacterials" -> "Antibacterials"
-    if name and any(c.isalpha() for c in name):
-        name = name.title()
-    
-    return name
+    # (a no-op for names without letters, so no separate check is needed)
+    return name.title()
 
 
-def fetch_wikipedia_summary(drug_name: str, delay: float = 1.0) -> Optional[str]:
-    """Fetch summary from Wikipedia API. Tries multiple variations if first attempt fails."""
-    normalized = normalize_drug_name(drug_name)
-    if not normalized:
-        return None
-    
-    # Try multiple variations of the name
-    variations = [normalized]
-    
-    # Try capitalized version (first letter uppercase)
-    if normalized and normalized[0].islower():
-        variations.append(normalized.capitalize())
-    
-    # Try title case (each word capitalized)
-    if " " in normalized:
-        variations.append(normalized.title())
-    
-    # Try singular form if plural (basic heuristic)
-    if normalized.endswith("s") and len(normalized) > 3:
-        singular = normalized[:-1]
-        variations.append(singular)
-        variations.append(singular.capitalize())
-    
-    # Try adding common suffixes for drug classes
-    if not any(normalized.lower().endswith(x) for x in ["agent", "drug", "antibiotic", "inhibitor"]):
-        variations.append(f"{normalized} agent")
-        variations.append(f"{normalized.capitalize()} agent")
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_variations = []
-    for var in variations:
-        if var not in seen:
-            seen.add(var)
-            unique_variations.append(var)
-    
-    # Try each variation
-    for attempt_name in unique_variations:
-        # Clean up name for URL
-        url_name = quote(attempt_name.replace(" ", "_"))
-        url = urljoin(WIKIPEDIA_API_BASE, url_name)
-        
-        try:
+def cache_key(content: str) -> str:
+    """Lookup cache key shared by every spelling of a name ("ASPIRIN", "aspirin (Bayer)")."""
+    return normalize_drug_name(content).lower()
+
+
+class RateLimiter:
+    """Space requests at least `min_interval` seconds apart.
+
+    Unlike sleeping before every request, requests only wait when they would
+    exceed the rate, so fast answers (including 404s) cost no extra time.
+    Meant for the tasks of one event loop, which reserve slots without locking.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(min_interval, 0.0)
+        self.next_allowed = 0.0
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        wait = self.next_allowed - now
+        self.next_allowed = max(now, self.next_allowed) + self.min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def open_wikipedia_session(concurrency: int = DEFAULT_CONCURRENCY) -> httpx.AsyncClient:
+    """Create the HTTP client used for every Wikipedia request of a run.
+
+    All traffic goes to one host, which speaks HTTP/2: concurrent requests are
+    multiplexed over a single kept-alive TLS connection. The connection limit
+    only matters if the server falls back to HTTP/1.1.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": USER_AGENT},
+        timeout=10,
+        limits=httpx.Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def truncate_summary(summary: str) -> str:
+    """Limit summary length."""
+    summary = summary.strip()
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[:SUMMARY_MAX_CHARS] + "..."
+    return summary
+
+
+async def get_wikipedia_json(
+    session: httpx.AsyncClient,
+    url: str,
+    label: str,
+    sem: asyncio.Semaphore,
+    limiter: RateLimiter,
+    params: Optional[Dict[str, str]] = None,
+) -> tuple[int, Optional[Any]]:
+    """GET a Wikipedia JSON endpoint, respecting the rate limit.
+
+    Returns `(status, data)`. `data` is None for 404s and for failures, which are
+    reported on stderr; `status` is 0 when no response was received.
+    """
+    try:
+        async with sem:
             # Respect rate limiting
-            time.sleep(delay)
-            
-            req = Request(url, headers={"User-Agent": "DrugGuideScraper/1.0"})
-            with urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                
-                # Extract summary
-                if "extract" in data:
-                    summary = data["extract"].strip()
-                    # Limit summary length
-                    if len(summary) > 500:
-                        summary = summary[:500] + "..."
-                    if attempt_name != normalized:
-                        print(f"    (found via variation: {attempt_name})")
-                    return summary
-                elif "title" in data and "extract_html" in data:
-                    # Fallback to HTML extract
-                    summary = re.sub(r"<[^>]+>", "", data["extract_html"]).strip()
-                    if len(summary) > 500:
-                        summary = summary[:500] + "..."
-                    if attempt_name != normalized:
-                        print(f"    (found via variation: {attempt_name})")
-                    return summary
-        except HTTPError as e:
-            if e.code == 404:
-                # Page not found, try next variation
-                continue
-            print(f"  HTTP error for '{attempt_name}': {e.code}", file=sys.stderr)
-            break  # Don't try more variations on non-404 errors
-        except URLError as e:
-            print(f"  URL error for '{attempt_name}': {e}", file=sys.stderr)
-            break
-        except json.JSONDecodeError as e:
-            print(f"  JSON decode error for '{attempt_name}': {e}", file=sys.stderr)
+            await limiter.acquire()
+
+            response = await session.get(url, params=params)
+        if response.status_code == 404:
+            return 404, None
+        if response.status_code >= 400:
+            print(f"  HTTP error for {label}: {response.status_code}", file=sys.stderr)
+            return response.status_code, None
+        body = response.content
+        return response.status_code, orjson.loads(body) if orjson is not None else json.loads(body)
+    except httpx.HTTPError as e:
+        print(f"  URL error for {label}: {e!r}", file=sys.stderr)
+    except json.JSONDecodeError as e:
+        print(f"  JSON decode error for {label}: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"  Unexpected error for {label}: {e}", file=sys.stderr)
+    return 0, None
+
+
+async def fetch_wikipedia_summaries_batch(
+    session: httpx.AsyncClient,
+    names: List[str],
+    sem: asyncio.Semaphore,
+    limiter: RateLimiter,
+) -> Dict[str, Optional[str]]:
+    """Fetch intro extracts for up to WIKIPEDIA_BATCH_SIZE titles in one Action API query.
+
+    Returns `name -> summary` for the names that resolved to an article with an
+    extract, and `name -> None` for names Wikipedia reports as missing. Other
+    names (including any whose continuation request fails) are left out.
+    """
+    params = {
+        "action": "query",
+        "format": "json",
+        "prop": "extracts",
+        "exintro": "1",
+        "explaintext": "1",
+        "exlimit": "max",
+        "redirects": "1",
+        "titles": "|".join(names),
+    }
+    extracts: Dict[str, str] = {}
+    missing = set()
+    renames: Dict[str, str] = {}
+    request_params = params
+    # TextExtracts serves a limited number of extracts per response and hands
+    # back a `continue` block for the rest of the batch
+    while True:
+        _, data = await get_wikipedia_json(
+            session, WIKIPEDIA_ACTION_API, f"batch of {len(names)} title(s)", sem, limiter, request_params
+        )
+        if data is None:
             break
-        except Exception as e:
-            print(f"  Unexpected error for '{attempt_name}': {e}", file=sys.stderr)
+
+        query = data.get("query", {})
+        pages = query.get("pages", {}).values()
+        for page in pages:
+            if "missing" in page or "invalid" in page:
+                missing.add(page.get("title"))
+            elif page.get("extract", "").strip():
+                extracts.setdefault(page["title"], page["extract"])
+        # Follow title normalization and redirects back to the requested names
+        for key in ("normalized", "redirects"):
+            for item in query.get(key, []):
+                renames[item["from"]] = item["to"]
+
+        if "continue" not in data:
             break
-    
-    # None of the variations worked
-    return None
+        request_params = {**params, **data["continue"]}
+
+    summaries = {}
+    for name in names:
+        title = renames.get(name, name)
+        title = renames.get(title, title)
+        if title in extracts:
+            summaries[name] = truncate_summary(extracts[title])
+        elif title in missing:
+            summaries[name] = None
+    return summaries
+
+
+async def fetch_wikipedia_summaries(
+    session: httpx.AsyncClient,
+    names: List[str],
+    sem: asyncio.Semaphore,
+    limiter: RateLimiter,
+) -> Dict[str, Optional[str]]:
+    """Run `fetch_wikipedia_summaries_batch` over any number of titles, batches in parallel."""
+    batches = await asyncio.gather(
+        *(
+            fetch_wikipedia_summaries_batch(session, names[i:i + WIKIPEDIA_BATCH_SIZE], sem, limiter)
+            for i in range(0, len(names), WIKIPEDIA_BATCH_SIZE)
+        )
+    )
+    return {name: summary for batch in batches for name, summary in batch.items()}
+
+
+async def wiki_search_title(
+    session: httpx.AsyncClient,
+    query: str,
+    sem: asyncio.Semaphore,
+    limiter: RateLimiter,
+) -> Optional[str]:
+    """Return the title of the best full-text search match for `query`.
+
+    Wikipedia's search resolves casing, plurals and near-miss titles server-side.
+    """
+    params = {
+        "action": "query",
+        "format": "json",
+        "list": "search",
+        "srsearch": query,
+        "srlimit": "1",
+        "srnamespace": "0",
+        "srprop": "",
+        "srinfo": "",
+    }
+    _, data = await get_wikipedia_json(
+        session, WIKIPEDIA_ACTION_API, f"search '{query}'", sem, limiter, params
+    )
+    results = data.get("query", {}).get("search", []) if isinstance(data, dict) else []
+    return results[0].get("title") if results else None
+
+
+async def search_wikipedia_summary(
+    session: httpx.AsyncClient,
+    name: str,
+    sem: asyncio.Semaphore,
+    limiter: RateLimiter,
+    retry_exact: bool = False,
+) -> Optional[str]:
+    """Look up a name the exact-title lookup could not resolve via Wikipedia search.
+
+    Costs one search request plus one extract request for the matched article.
+    Pass `retry_exact` when the exact lookup got no verdict (the request failed,
+    or the page had no extract): the name itself is then retried if the search
+    finds nothing else.
+    """
+    title = await wiki_search_title(session, name, sem, limiter)
+    if not title or title == name:
+        # Nothing found, or only the title that was already tried
+        if not retry_exact:
+            return None
+        title = name
+    summary = (await fetch_wikipedia_summaries_batch(session, [title], sem, limiter)).get(title)
+    if summary and title != name:
+        print(f"    (found via search: {title})")
+    return summary
+
+
+def read_json(path: Path) -> Any:
+    """Parse a JSON file, with orjson when available.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+    """
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with path.open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+class WikiCache:
+    """Cross-run store of Wikipedia lookups in a small SQLite database.
+
+    Each row is `(key, summary, fetched_at)`; a NULL summary records a lookup
+    that found nothing. Every result is committed as soon as it is stored, so
+    an interrupted run keeps everything it fetched.
+    """
+
+    def __init__(self, path: Path):
+        # One connection for the run; every guide uses it from the event loop thread
+        self._conn = sqlite3.connect(str(path))
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, summary TEXT, fetched_at INTEGER NOT NULL)"
+            )
+
+    def fresh(self, ttl_days: float) -> Dict[str, Optional[str]]:
+        """Return `key -> summary` for entries newer than `ttl_days`.
+
+        Negative entries expire after NEGATIVE_CACHE_TTL_DAYS at most.
+        """
+        now = time.time()
+        found_cutoff = now - ttl_days * 86400
+        missing_cutoff = now - min(ttl_days, NEGATIVE_CACHE_TTL_DAYS) * 86400
+        rows = self._conn.execute(
+            "SELECT key, summary FROM summaries "
+            "WHERE fetched_at >= CASE WHEN summary IS NULL THEN ? ELSE ? END",
+            (missing_cutoff, found_cutoff),
+        ).fetchall()
+        return dict(rows)
+
+    def set(self, key: str, summary: Optional[str]) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, fetched_at) VALUES (?, ?, ?)",
+                (key, summary, int(time.time())),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def read_summary_journal(journal_path: Path) -> Dict[str, Optional[str]]:
+    """Return `cache key -> summary` recorded in a guide's journal by an interrupted run."""
+    summaries = {}
+    loads = orjson.loads if orjson is not None else json.loads
+    try:
+        with journal_path.open("rb") as fh:
+            for line in fh:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    # e.g. a line cut short by the interruption, possibly mid
+                    # UTF-8 character (JSONDecodeError and UnicodeDecodeError
+                    # both subclass ValueError, as does orjson's error)
+                    continue
+                if isinstance(record, dict) and "c" in record:
+                    summaries[record["c"]] = record.get("s")
+    except FileNotFoundError:
+        pass
+    return summaries
+
 
+def encode_journal_record(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
 
-def process_guide_file(guide_path: Path, force: bool = False, delay: float = 1.0) -> bool:
-    """Process a single guide file."""
+
+def write_guide_json(path: Path, payload: dict) -> None:
+    """Replace a guide atomically, so an interruption never leaves it half-written."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        if orjson is not None:
+            with tmp_path.open("wb") as fh:
+                fh.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        else:
+            with tmp_path.open("w", encoding="utf-8") as fh:
+                json.dump(payload, fh, ensure_ascii=False, indent=2)
+                fh.write("\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Includes KeyboardInterrupt: never leave a partial file in data/
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def process_guide_async(
+    guide_path: Path,
+    session: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    limiter: RateLimiter,
+    force: bool = False,
+    wiki_cache: Optional[WikiCache] = None,
+    cache_ttl_days: float = 30.0,
+) -> bool:
+    """Process a single guide file.
+
+    `session`, `sem` and `limiter` may be shared by guides processed
+    concurrently, so the request budget is global rather than per guide.
+    `wiki_cache` is shared across guides: fresh entries seed the lookup cache
+    and every new Wikipedia result is recorded in it.
+    """
     print(f"\nProcessing: {guide_path.name}")
     
     try:
-        with guide_path.open("r", encoding="utf-8") as fh:
-            guide_data = json.load(fh)
+        guide_data = read_json(guide_path)
     except (json.JSONDecodeError, IOError) as e:
         print(f"  Error reading file: {e}", file=sys.stderr)
         return False
@@ -229,79 +562,87 @@ def process_guide_file(guide_path: Path, force: bool = False, delay: float = 1.0
     updated_count = 0
     skipped_count = 0
     error_count = 0
-    
-    # First pass: Build content cache from existing summaries to avoid re-searching
-    # Key: normalized content, Value: summary found (or None if not found)
-    content_cache = {}
-    
-    # Pre-populate cache with existing summaries (to avoid re-searching duplicates)
+    # One timestamp for every cell updated in this run
+    run_timestamp = time.strftime(DATE_FORMAT)
+    
+    # Content cache built from existing summaries to avoid re-searching
+    # Key: cache_key(content), Value: summary found (or None if not found)
+    content_cache = wiki_cache.fresh(cache_ttl_days) if wiki_cache is not None else {}
+    
+    # Summaries fetched by an interrupted run are reused; new ones are appended
+    # as they arrive so Ctrl+C never has to re-serialize the whole guide
+    journal_path = guide_path.with_suffix(JOURNAL_SUFFIX)
+    content_cache.update(read_summary_journal(journal_path))
+    # Opened on the first fetched summary, inside the try below
+    journal = None
+    journaled_count = 0
+    
+    # Current convert_guides.py output stores content already normalized
+    content_is_normalized = guide_data.get("_cellDataVersion", 1) >= CELL_DATA_VERSION
+    
+    # Single pass: group cells by content to process duplicates together,
+    # pre-populate the cache with existing summaries and track per-group state
+    cells_by_content = {}
+    group_state = {}
     for cell_id, cell_info in cell_data.items():
         raw_content = cell_info.get("content", "")
-        content = normalize_content_for_storage(raw_content)
+        content = raw_content if content_is_normalized else normalize_content_for_storage(raw_content)
+        if not content:
+            continue
+        # Check if content looks like a drug name
+        if not is_likely_drug_name(content):
+            skipped_count += 1
+            continue
+        
+        # Strip each summary once; groups remember which cells already have one
         existing_summary = cell_info.get("summary", "").strip()
+        cells_by_content.setdefault(content, []).append((cell_id, cell_info, bool(existing_summary)))
+        state = group_state.setdefault(content, {"has_existing": False})
         
-        if content and existing_summary:
-            # Treat "no data" as None in cache (already tried and failed)
+        if existing_summary:
+            key = cache_key(content)
+            # Treat "no data" as None in cache (already tried and failed),
+            # unless another spelling of the same name has a summary
             if existing_summary != "no data":
-                content_cache[content] = existing_summary
-            else:
-                content_cache[content] = None
+                content_cache[key] = existing_summary
+                state["has_existing"] = True
+            elif not content_cache.get(key):
+                content_cache[key] = None
     
-    # Second pass: Process cells, but only fetch summaries for unique content
-    # Group cells by content to process duplicates together
-    cells_by_content = {}
-    for cell_id, cell_info in cell_data.items():
-        raw_content = cell_info.get("content", "")
-        content = normalize_content_for_storage(raw_content)
-        
-        if not content:
-            continue
-            
-        if content not in cells_by_content:
-            cells_by_content[content] = []
-        cells_by_content[content].append((cell_id, cell_info))
+    # Unique content that still needs a Wikipedia lookup
+    pending = []
     
     # Process each unique content once
     try:
         for content, cell_list in cells_by_content.items():
             # Verify first cell ID format (they should all be similar)
             first_cell_id = cell_list[0][0]
-            if not re.match(r"table_\d+_row_\d+_col_\d+", first_cell_id):
+            if not _CELL_ID_RE.match(first_cell_id):
                 print(f"  Warning: Unexpected cell ID format: {first_cell_id}", file=sys.stderr)
             
-            # Check if content looks like a drug name
-            if not is_likely_drug_name(content):
-                skipped_count += len(cell_list)
-                continue
-            
             # Check if we already have a summary in cache
-            if content in content_cache:
-                cached_summary = content_cache[content]
+            key = cache_key(content)
+            if key in content_cache:
+                cached_summary = content_cache[key]
                 normalized_display = normalize_drug_name(content)
                 
                 # Apply cached summary to all cells with this content
-                for cell_id, cell_info in cell_list:
-                    existing_summary = cell_info.get("summary", "").strip()
-                    
+                for cell_id, cell_info, has_summary in cell_list:
                     # Skip if summary already exists and not forcing
-                    if existing_summary and not force:
+                    if has_summary and not force:
                         skipped_count += 1
                         continue
                     
                     if cached_summary:
                         cell_info["summary"] = cached_summary
-                        cell_info["lastUpdated"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
-                        if cell_info.get("content") != content:
-                            cell_info["content"] = content
-                        updated_count += 1
                     else:
                         # We already tried and failed, mark as "no data"
                         cell_info["summary"] = "no data"
-                        cell_info["lastUpdated"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
-                        if cell_info.get("content") != content:
-                            cell_info["content"] = content
-                        updated_count += 1
                         error_count += 1
+                    cell_info["lastUpdated"] = run_timestamp
+                    if cell_info.get("content") != content:
+                        cell_info["content"] = content
+                    updated_count += 1
                 
                 if cached_summary:
                     print(f"  Using cached summary for: {normalized_display} ({len(cell_list)} duplicate cell(s))")
@@ -310,74 +651,137 @@ def process_guide_file(guide_path: Path, force: bool = False, delay: float = 1.0
                 continue
             
             # Check if any cell already has a summary (and we're not forcing)
-            if not force:
-                has_existing = any(
-                    cell_info.get("summary", "").strip() and cell_info.get("summary", "").strip() != "no data"
-                    for _, cell_info in cell_list
-                )
-                if has_existing:
-                    skipped_count += len(cell_list)
-                    continue
-            
-            # Fetch summary once for this unique content
-            normalized_content = normalize_drug_name(content)
-            print(f"  Fetching summary for: {normalized_content} ({len(cell_list)} cell(s) with this content)")
-            summary = fetch_wikipedia_summary(content, delay)
+            if not force and group_state[content]["has_existing"]:
+                skipped_count += len(cell_list)
+                continue
             
-            # Cache the result (even if None) to avoid re-searching duplicates
-            content_cache[content] = summary
+            # Fetch summary once for this unique content (concurrently, below)
+            pending.append((content, cell_list))
+
+        applied_count = 0
+
+        def apply_summary(content, cell_list, summary):
+            nonlocal updated_count, error_count, journal, journaled_count, applied_count
+            # Cache the result (even if None) to avoid re-searching duplicates;
+            # other spellings of the same name reuse the first one recorded
+            key = cache_key(content)
+            if key not in content_cache:
+                content_cache[key] = summary
+                if wiki_cache is not None:
+                    wiki_cache.set(key, summary)
+                if journal is None:
+                    journal = journal_path.open("ab", buffering=0)
+                journal.write(encode_journal_record({"c": key, "s": summary, "t": run_timestamp}))
+                journaled_count += 1
             
             # Apply summary to all cells with this content
-            for cell_id, cell_info in cell_list:
+            for cell_id, cell_info, _ in cell_list:
                 if summary:
                     cell_info["summary"] = summary
-                    cell_info["lastUpdated"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
                 else:
                     cell_info["summary"] = "no data"
-                    cell_info["lastUpdated"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
                     error_count += 1
+                cell_info["lastUpdated"] = run_timestamp
                 
                 # Ensure content is normalized and stored correctly
                 if cell_info.get("content") != content:
                     cell_info["content"] = content
                 updated_count += 1
             
+            applied_count += 1
+            progress = f"[{applied_count}/{len(pending)}]"
+            normalized_content = normalize_drug_name(content)
             if summary:
-                print(f"    ✓ Found summary ({len(summary)} chars) - applied to {len(cell_list)} cell(s)")
+                print(f"    {progress} ✓ {normalized_content}: found summary ({len(summary)} chars) - applied to {len(cell_list)} cell(s)")
             else:
-                print(f"    ✗ No summary found (stored 'no data' for {len(cell_list)} cell(s))")
+                print(f"    {progress} ✗ {normalized_content}: no summary found (stored 'no data' for {len(cell_list)} cell(s))")
+
+        async def fetch_pending():
+            # Look up exact titles in batches first
+            names = {content: normalize_drug_name(content) for content, _ in pending}
+            unique_names = list(dict.fromkeys(name for name in names.values() if name))
+            found = await fetch_wikipedia_summaries(session, unique_names, sem, limiter)
+            
+            # Names the batches could not resolve fall back to a search; spellings
+            # that normalize to the same title share one lookup
+            misses: Dict[str, list] = {}
+            for content, cell_list in pending:
+                name = names[content]
+                if found.get(name):
+                    apply_summary(content, cell_list, found[name])
+                else:
+                    misses.setdefault(name.lower(), []).append((content, cell_list))
+            
+            async def search_group(groups):
+                name = names[groups[0][0]]
+                summary = None
+                if name:
+                    summary = await search_wikipedia_summary(
+                        session, name, sem, limiter, retry_exact=name not in found
+                    )
+                # Applied (and journaled) as soon as this lookup finishes
+                for content, cell_list in groups:
+                    apply_summary(content, cell_list, summary)
+            
+            await asyncio.gather(*(search_group(groups) for groups in misses.values()))
+
+        if pending:
+            print(f"  Fetching {len(pending)} summaries...")
+            await fetch_pending()
     
-    except KeyboardInterrupt:
+    # Ctrl+C cancels every guide still in progress
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print(f"\n\n  ⚠ Interrupted by user (Ctrl+C)")
-        if updated_count > 0:
-            print(f"  Saving progress ({updated_count} summaries found so far)...")
-            try:
-                with guide_path.open("w", encoding="utf-8") as fh:
-                    json.dump(guide_data, fh, ensure_ascii=False, indent=2)
-                    fh.write("\n")
-                print(f"  ✓ Progress saved! {updated_count} summaries preserved.")
-                print(f"  You can resume by running the script again - it will skip existing summaries.")
-            except IOError as e:
-                print(f"  ✗ Error saving progress: {e}", file=sys.stderr)
-                print(f"  ⚠ Warning: {updated_count} summaries may be lost!", file=sys.stderr)
+        if journaled_count > 0:
+            print(f"  ✓ {journaled_count} fetched summaries are kept in {journal_path.name}.")
+            print(f"  You can resume by running the script again - it will reuse them.")
         else:
-            print(f"  No progress to save (no summaries found yet).")
+            print(f"  No progress to save (no summaries fetched yet).")
         raise  # Re-raise to exit
+    finally:
+        if journal is not None:
+            journal.close()
     
     # Save updated data
     if updated_count > 0:
         try:
-            with guide_path.open("w", encoding="utf-8") as fh:
-                json.dump(guide_data, fh, ensure_ascii=False, indent=2)
-                fh.write("\n")
+            write_guide_json(guide_path, guide_data)
             print(f"\n  Updated {updated_count} summaries, skipped {skipped_count}, errors {error_count}")
-            return True
         except IOError as e:
             print(f"  Error saving file: {e}", file=sys.stderr)
             return False
     else:
         print(f"\n  No updates needed. Skipped {skipped_count}, errors {error_count}")
-        return True
+    
+    # Everything in the journal is now part of the guide
+    journal_path.unlink(missing_ok=True)
+    return True
+
+
+async def process_guides(
+    guide_files: List[Path],
+    succeeded: List[Path],
+    workers: int,
+    delay: float,
+    concurrency: int,
+    **options: Any,
+) -> None:
+    """Process guides, up to `workers` at a time, appending each success to `succeeded`.
+
+    Every guide shares one HTTP client, request semaphore and rate limiter.
+    """
+    guide_slots = asyncio.Semaphore(workers)
+
+    async with open_wikipedia_session(concurrency) as session:
+        sem = asyncio.Semaphore(concurrency)
+        limiter = RateLimiter(delay)
+
+        async def run_guide(guide_path: Path) -> None:
+            async with guide_slots:
+                if await process_guide_async(guide_path, session, sem, limiter, **options):
+                    succeeded.append(guide_path)
+
+        await asyncio.gather(*(run_guide(path) for path in guide_files))
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -389,16 +793,19 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Input directory not found: {input_dir}", file=sys.stderr)
         return 1
     
-    # Find guide files
+    # Find guide files, in processing order
     if args.guide:
-        guide_files = [input_dir / args.guide]
-        guide_files = [f for f in guide_files if f.exists() and f.suffix == ".json"]
+        guide_path = input_dir / args.guide
+        if not (guide_path.suffix == ".json" and guide_path.is_file()):
+            print(f"Guide file not found: {guide_path}", file=sys.stderr)
+            return 1
+        guide_files = [guide_path]
     else:
         # Process all JSON files except index
-        guide_files = [
+        guide_files = sorted(
             f for f in input_dir.glob("*.json")
-            if f.name != "guides.index.json"
-        ]
+            if f.name != INDEX_FILENAME and not f.name.startswith(".")
+        )
     
     if not guide_files:
         print(f"No guide files found in {input_dir}", file=sys.stderr)
@@ -407,20 +814,41 @@ def main(argv: list[str] | None = None) -> int:
     print(f"Found {len(guide_files)} guide file(s) to process")
     if args.force:
         print("Force mode: will re-fetch all summaries")
-    print(f"Delay between requests: {args.delay}s")
+    print(f"Delay between requests: {args.delay}s ({args.concurrency} concurrent)")
+    if args.workers > 1:
+        print(f"Processing {args.workers} guides in parallel")
     print(f"Press Ctrl+C to stop and save progress\n")
     
-    success_count = 0
     try:
-        for guide_file in sorted(guide_files):
-            if process_guide_file(guide_file, args.force, args.delay):
-                success_count += 1
+        wiki_cache = WikiCache(SCRIPT_DIR / WIKI_CACHE_FILENAME)
+    except sqlite3.Error as e:
+        print(f"Error opening {WIKI_CACHE_FILENAME}: {e}", file=sys.stderr)
+        return 1
+    
+    # Filled in as guides finish, so an interrupted run can still report them
+    succeeded: List[Path] = []
+    try:
+        asyncio.run(
+            process_guides(
+                guide_files,
+                succeeded,
+                workers=args.workers,
+                delay=args.delay,
+                concurrency=args.concurrency,
+                force=args.force,
+                wiki_cache=wiki_cache,
+                cache_ttl_days=args.cache_ttl_days,
+            )
+        )
     except KeyboardInterrupt:
-        # Already handled in process_guide_file, but catch here too for multi-file processing
+        # Already handled in process_guide_async, but catch here too for multi-file processing
         print(f"\n{'='*60}")
-        print(f"Processing stopped. Completed {success_count}/{len(guide_files)} guide(s)")
+        print(f"Processing stopped. Completed {len(succeeded)}/{len(guide_files)} guide(s)")
         return 1
+    finally:
+        wiki_cache.close()
     
+    success_count = len(succeeded)
     print(f"\n{'='*60}")
     print(f"Processed {success_count}/{len(guide_files)} guide(s) successfully")
     